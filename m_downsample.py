@@ -0,0 +1,133 @@
+# ###########################################################################
+#
+# File    : m_downsample.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Module with functions to downsample long series before
+#           plotting them.
+#
+# NOTE    : A line chart can't show more points than the pixels of its
+#           axes. The functions return the indices of the points to
+#           keep, so the same selection can be applied to x and y.
+#
+# ###########################################################################
+
+import numpy as np
+
+
+METHODS = ("lttb", "minmax", "none")
+
+
+def minmax(y: np.ndarray, nout: int) -> np.ndarray:
+    """Min/max envelope. Splits the series in nout/2 buckets and keeps
+    the minimum and the maximum of each one, so peaks are never lost.
+    Returns the sorted indices of the points to keep.
+
+    Keyword arguments:
+    - y: series values (NaN values are ignored);
+    - nout: maximum amount of points to keep.
+    """
+
+    size = len(y)
+    nbk = nout // 2
+
+    if nbk < 1 or size <= nout:
+        return np.arange(size)
+
+    # Equal sized buckets. The last one is padded with its last value:
+    #
+    step = int(np.ceil(size / nbk))
+    nbk = int(np.ceil(size / step))
+    blk = np.concatenate([y, np.full(nbk*step - size, y[-1])])
+    blk = blk.reshape(nbk, step)
+
+    base = np.arange(nbk) * step
+    imin = base + np.argmin(np.where(np.isnan(blk), np.inf, blk), axis=1)
+    imax = base + np.argmax(np.where(np.isnan(blk), -np.inf, blk), axis=1)
+
+    idx = np.concatenate([[0], imin, imax, [size-1]])
+    return np.unique(np.minimum(idx, size-1))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, nout: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets. Keeps the first and last points
+    and, in each of the nout-2 buckets between them, the point that
+    makes the largest triangle with the previous kept point and the
+    average of the next bucket. Preserves the visual shape of the line.
+    Returns the sorted indices of the points to keep.
+
+    Keyword arguments:
+    - x: series abscissas, as numbers (e.g.: matplotlib dates);
+    - y: series values;
+    - nout: maximum amount of points to keep (>= 3).
+    """
+
+    size = len(x)
+
+    if nout < 3 or size <= nout:
+        return np.arange(size)
+
+    edges = np.linspace(1, size-1, nout-1).astype("i8")
+    idx = np.empty(nout, dtype="i8")
+    idx[0], idx[-1] = 0, size-1
+    prev = 0
+
+    for pos in range(nout-2):
+        low, upp = edges[pos], edges[pos+1]
+
+        # Average of the next bucket (the last point for the last one):
+        nlow = upp
+        nupp = edges[pos+2] if pos+2 < len(edges) else size
+        avx = x[nlow:nupp].mean()
+        avy = np.nanmean(y[nlow:nupp]) if nupp > nlow else y[-1]
+
+        # Triangle areas (x2) with the previous kept point:
+        area = np.abs(
+            (x[prev] - avx) * (y[low:upp] - y[prev])
+            - (x[prev] - x[low:upp]) * (avy - y[prev])
+        )
+        prev = low + np.argmax(np.where(np.isnan(area), -1, area))
+        idx[pos+1] = prev
+
+    return idx
+
+
+def npoints(ax, method: str) -> int:
+    """Point budget of a line in a matplotlib axes, based on its width
+    in pixels: one point per pixel for 'lttb' and two (minimum and
+    maximum) for 'minmax'.
+
+    Keyword arguments:
+    - ax: matplotlib axes where the line is drawn;
+    - method: downsampling method ('lttb' or 'minmax').
+    """
+
+    width = int(ax.get_window_extent().width)
+    return 2*width if method == "minmax" else width
+
+
+def downsample(
+    x: np.ndarray, y: np.ndarray, nout: int, method: str = "lttb",
+) -> np.ndarray:
+    """Returns the indices of the points to keep from a series.
+
+    Keyword arguments:
+    - x: series abscissas, as numbers;
+    - y: series values;
+    - nout: maximum amount of points to keep;
+    - method: 'lttb', 'minmax' or 'none' (keeps all points).
+    """
+
+    if method not in METHODS:
+        print("[ERROR] m_downsample.downsample: ValueError")
+        print(f"\tUnknown method '{method}'. Options: {', '.join(METHODS)}.")
+        raise SystemExit
+
+    if method == "lttb":
+        return lttb(x, y, nout)
+    if method == "minmax":
+        return minmax(y, nout)
+    return np.arange(len(x))
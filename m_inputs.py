@@ -6,7 +6,7 @@
 #
 # Created : 2025 04 26
 #
-# Updated : 2025 04 30
+# Updated : 2026 10 18
 #
 # Descrp. : Module with initialization functions.
 #
@@ -16,14 +16,18 @@ from json import load
 from os import path
 
 
-def init_file(grp: str) -> dict:
+FINIT = "init_HDFView.json"
+
+
+def init_file(grp: str, fipt: str = FINIT, over: dict = None) -> dict:
     """Check initialization file 'init_HDFView.json'.
     
-    Keyword argument:
-    - grp: name of the group inside the initialization file.
+    Keyword arguments:
+    - grp: name of the group inside the initialization file;
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file
+        (e.g.: command line options). None values are ignored.
     """
-
-    fipt = "init_HDFView.json"
     
     if not path.isfile(fipt):
         print("[ERROR] m_inputs.init_file: FileNotFoundError")
@@ -41,36 +45,57 @@ def init_file(grp: str) -> dict:
         print(f"\tInputs not found for the group '{grp}' .")
         raise SystemExit
     
+    # Apply overrides:
+    if over:
+        inpts.update({key: val for key, val in over.items() if val is not None})
+
     return inpts
 
 
-def init_plotTS() -> str:
+def init_plotTS(fipt: str = FINIT, over: dict = None) -> list:
     """Reads and checks the inputs from the file 'init_HDFView.json'
-    for plotting MOHID time series files.
+    for plotting MOHID time series files. Returns a list with the
+    time series files ('tsfile' can be one file or a list of files).
+    
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
     """
 
     # Check input file:
-    inpts = init_file("TS")
+    inpts = init_file("TS", fipt, over)
 
     # Check inputs:
     key = "tsfile"
     val = inpts.get(key)
 
-    if not isinstance(val, str) or not path.isfile(val):
-        print("[ERROR] m_inputs.init_plotTS: FileNotFoundError")
-        print(f"\tTime series file not found: '{val}' .")
+    if isinstance(val, str): val = [val]
+
+    if not isinstance(val, list) or not val:
+        print("[ERROR] m_inputs.init_plotTS: TypeError")
+        print(f"\t'{key}' should contain a file name or a list of them.")
         raise SystemExit
+
+    for fin in val:
+        if not isinstance(fin, str) or not path.isfile(fin):
+            print("[ERROR] m_inputs.init_plotTS: FileNotFoundError")
+            print(f"\tTime series file not found: '{fin}' .")
+            raise SystemExit
     
     return val
     
 
-def init_plotHDF() -> dict:
+def init_plotHDF(fipt: str = FINIT, over: dict = None) -> dict:
     """Reads and checks the inputs from the file 'init_HDFView.json'
     for plotting MOHID HDF5 fields.
+    
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
     """
 
     # Check input file:
-    inpts = init_file("HDF")
+    inpts = init_file("HDF", fipt, over)
 
     # Check inputs:
     key = "hdf"
@@ -160,16 +185,75 @@ def init_plotHDF() -> dict:
         print("[ERROR] m_inputs.init_plotHDF: TypeError")
         print(f"\t'{key}' should contain a time string format.")
         raise SystemExit
+    
+    for key in ("vmin", "vmax"):
+        val = inpts.get(key)
+
+        if val is not None and not isinstance(val, (int,float)):
+            print("[ERROR] m_inputs.init_plotHDF: TypeError")
+            print(f"\t'{key}' is not a number.")
+            raise SystemExit
+
+    key = "prefetch"
+    val = inpts.get(key, 2)
+
+    if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+        print("[ERROR] m_inputs.init_plotHDF: TypeError")
+        print(f"\t'{key}' should contain an integer >= 0.")
+        raise SystemExit
     return inpts
 
 
-def init_plotLAGR() -> dict:
+def init_statsHDF(fipt: str = FINIT, over: dict = None) -> dict:
+    """Reads and checks the inputs from the file 'init_HDFView.json'
+    (group 'HDF') for the statistics of a MOHID HDF5 field.
+
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
+    """
+
+    # Check input file:
+    inpts = init_file("HDF", fipt, over)
+
+    # Check inputs:
+    key = "hdf"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or not path.isfile(val):
+        print("[ERROR] m_inputs.init_statsHDF: FileNotFoundError")
+        print(f"\tHDF5 file not found: '{val}' .")
+        raise SystemExit
+
+    key = "field"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or val == "":
+        print("[ERROR] m_inputs.init_statsHDF: ValueError")
+        print(f"\t'{key}' should contain the name of a MOHID HDF5 field.")
+        raise SystemExit
+
+    key = "layer"
+    val = inpts.get(key)
+
+    if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+        print("[ERROR] m_inputs.init_statsHDF: TypeError")
+        print(f"\t'{key}' should contain an integer >= 0.")
+        raise SystemExit
+    return inpts
+
+
+def init_plotLAGR(fipt: str = FINIT, over: dict = None) -> dict:
     """Reads and checks the inputs from the file 'init_HDFView.json'
     for plotting lagrangian particles.
+    
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
     """
 
     # Check input file:
-    inpts = init_file("LAGR")
+    inpts = init_file("LAGR", fipt, over)
 
     # Check inputs:
     key = "hdf"
@@ -252,4 +336,176 @@ def init_plotLAGR() -> dict:
         print("[ERROR] m_inputs.init_plotLAGR: TypeError")
         print(f"\t'{key}' should contain a time string format.")
         raise SystemExit
+    
+    key = "prefetch"
+    val = inpts.get(key, 2)
+
+    if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+        print("[ERROR] m_inputs.init_plotLAGR: TypeError")
+        print(f"\t'{key}' should contain an integer >= 0.")
+        raise SystemExit
+    return inpts
+
+
+def init_plotVERT(fipt: str = FINIT, over: dict = None) -> dict:
+    """Reads and checks the inputs from the file 'init_HDFView.json'
+    for plotting vertical sections and profiles of MOHID HDF5 fields.
+    
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
+    """
+
+    # Check input file:
+    inpts = init_file("VERT", fipt, over)
+
+    # Check inputs:
+    key = "hdf"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or not path.isfile(val):
+        print("[ERROR] m_inputs.init_plotVERT: FileNotFoundError")
+        print(f"\tHDF5 file not found: '{val}' .")
+        raise SystemExit
+    
+    key = "outdir"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or not path.isdir(val):
+        print("[ERROR] m_inputs.init_plotVERT: FileNotFoundError")
+        print(f"\tOutput directory not found: '{val}'.")
+        raise SystemExit
+    
+    key = "prefix"
+    val = inpts.get(key)
+
+    if not isinstance(val, str):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain a string.")
+        raise SystemExit
+      
+    key = "field"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or val == "":
+        print("[ERROR] m_inputs.init_plotVERT: ValueError")
+        print(f"\t'{key}' should contain the name of a MOHID HDF5 field.")
+        raise SystemExit
+    
+    key = "mode"
+    val = inpts.get(key)
+
+    if val not in ("section", "profile"):
+        print("[ERROR] m_inputs.init_plotVERT: ValueError")
+        print(f"\t'{key}' should be 'section' or 'profile'.")
+        raise SystemExit
+    
+    key = "points"
+    val = inpts.get(key)
+    npts = 2 if inpts.get("mode") == "section" else 1
+
+    if not isinstance(val, list) or len(val) < npts or not all(
+        isinstance(pnt, list) and len(pnt) == 2
+        and all(isinstance(num, (int,float)) for num in pnt)
+        for pnt in val
+    ):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain at least {npts}", end=" ")
+        print("[longitude, latitude] point(s).")
+        raise SystemExit
+    
+    key = "cmap"
+    val = inpts.get(key)
+
+    if not isinstance(val, str):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain a string.")
+        raise SystemExit
+    
+    key = "label"
+    val = inpts.get(key)
+
+    if not isinstance(val, str):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain a string.")
+        raise SystemExit
+    
+    key = "levels"
+    val = inpts.get(key)
+
+    if not isinstance(val, int):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain an integer >= 1.")
+        raise SystemExit
+    
+    key = "timestr"
+    val = inpts.get(key)
+
+    if not isinstance(val, str):
+        print("[ERROR] m_inputs.init_plotVERT: TypeError")
+        print(f"\t'{key}' should contain a time string format.")
+        raise SystemExit
+    return inpts
+
+
+def init_statsLAGR(fipt: str = FINIT, over: dict = None) -> dict:
+    """Reads and checks the inputs from the file 'init_HDFView.json'
+    for the statistics of lagrangian particles.
+    
+    Keyword arguments:
+    - fipt: name and path of the initialization file;
+    - over: inputs that replace the ones read from the file.
+    """
+
+    # Check input file:
+    inpts = init_file("LAGRSTATS", fipt, over)
+
+    # Check inputs:
+    key = "hdf"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or not path.isfile(val):
+        print("[ERROR] m_inputs.init_statsLAGR: FileNotFoundError")
+        print(f"\tHDF5 file not found: '{val}' .")
+        raise SystemExit
+    
+    key = "outdir"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or not path.isdir(val):
+        print("[ERROR] m_inputs.init_statsLAGR: FileNotFoundError")
+        print(f"\tOutput directory not found: '{val}'.")
+        raise SystemExit
+    
+    key = "origin_name"
+    val = inpts.get(key)
+
+    if not isinstance(val, str) or val == "":
+        print("[ERROR] m_inputs.init_statsLAGR: TypeError")
+        print(f"\t'{key}' should contain a string.")
+        raise SystemExit
+    
+    key = "polygons"
+    val = inpts.get(key)
+
+    if not isinstance(val, dict) or not 0 < len(val) <= 64 or not all(
+        isinstance(pol, list) and len(pol) >= 3 and all(
+            isinstance(pnt, list) and len(pnt) == 2
+            and all(isinstance(num, (int,float)) for num in pnt)
+            for pnt in pol
+        )
+        for pol in val.values()
+    ):
+        print("[ERROR] m_inputs.init_statsLAGR: TypeError")
+        print(f"\t'{key}' should contain 1 to 64 polygons, each one", end=" ")
+        print("with at least 3 [longitude, latitude] points.")
+        raise SystemExit
+    
+    key = "prefetch"
+    val = inpts.get(key, 2)
+
+    if not isinstance(val, int) or isinstance(val, bool) or val < 0:
+        print("[ERROR] m_inputs.init_statsLAGR: TypeError")
+        print(f"\t'{key}' should contain an integer >= 0.")
+        raise SystemExit
     return inpts
@@ -0,0 +1,300 @@
+# ###########################################################################
+#
+# File    : m_inspect.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Module to inspect the metadata of MOHID HDF5 files and to
+#           keep a catalogue (SQLite) of the files of a directory tree.
+#
+# NOTE    : Only metadata is read: shapes, types and chunks come from
+#           the dataset headers, and the time span from the first and
+#           last datasets of the group '/Time'.
+#
+# ###########################################################################
+
+import sqlite3
+from datetime import datetime
+from os import path, walk
+
+
+HDFEXT = (".hdf5", ".hdf", ".h5")
+
+# Number of files indexed between commits to the catalogue:
+BATCH = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id      INTEGER PRIMARY KEY,
+    path    TEXT UNIQUE NOT NULL,
+    mtime   REAL,
+    size    INTEGER,
+    tstart  TEXT,
+    tend    TEXT,
+    nsteps  INTEGER,
+    nlayers INTEGER
+);
+CREATE TABLE IF NOT EXISTS fields (
+    file    INTEGER REFERENCES files(id) ON DELETE CASCADE,
+    path    TEXT,
+    name    TEXT,
+    steps   INTEGER,
+    shape   TEXT,
+    dtype   TEXT,
+    chunks  TEXT
+);
+CREATE INDEX IF NOT EXISTS files_time ON files(tstart, tend);
+CREATE INDEX IF NOT EXISTS fields_name ON fields(name);
+CREATE INDEX IF NOT EXISTS fields_file ON fields(file);
+"""
+
+
+def getmeta(hdfin: str) -> dict:
+    """Reads the metadata of a MOHID HDF5 file, without reading the
+    data of the fields. Returns a dictionary with the keys:
+    - tstart, tend: first and last instants (datetime or None);
+    - nsteps: number of time steps;
+    - nlayers: number of vertical layers (1 for 2D files);
+    - fields: list of dictionaries with the path, the number of steps
+        and the shape, type, chunks and compression of one step;
+    - origins: Lagrangian origin names and their property names.
+
+    Keyword argument:
+    - hdfin: name and path of the MOHID HDF5 file.
+    """
+
+    # A field is a group with one dataset per time step (e.g.:
+    # '/Results/temperature/temperature_00001'). In Lagrangian files
+    # the fields are inside the origin groups ('/Results/WWTP/...').
+
+    # The groups are walked without opening the datasets of the steps:
+    # the walk stops at the first group whose first and last members are
+    # datasets. Only groups that mix datasets and groups (e.g.: '/Grid')
+    # have all their members checked.
+
+    from h5py import Dataset, File, Group
+
+    flds = []
+
+    def visit(name, grp):
+        keys = list(grp.keys())
+        if not keys: return
+
+        if grp.get(keys[0], getclass=True) is Dataset \
+                and grp.get(keys[-1], getclass=True) is Dataset:
+            dset = grp[keys[0]]
+            flds.append({
+                "path": name, "steps": len(keys), "shape": dset.shape,
+                "dtype": str(dset.dtype), "chunks": dset.chunks,
+                "compression": dset.compression,
+            })
+            return
+
+        for key in keys:
+            if grp.get(key, getclass=True) is Group:
+                visit(f"{name}/{key}" if name else key, grp[key])
+
+    # The file is closed even if it has bad metadata (e.g.: a zero date):
+    #
+    tstart = tend = None
+    nsteps = 0
+
+    with File(hdfin, "r") as hdf:
+        for key in hdf.keys():
+            if hdf.get(key, getclass=True) is Group: visit(key, hdf[key])
+
+        # Time span. Only the first and last instants are read:
+        if "Time" in hdf and len(hdf["Time"]):
+            keys = list(hdf["Time"].keys())
+            nsteps = len(keys)
+            tstart = datetime(*hdf["Time"][keys[0]][...].astype("i2"))
+            tend = datetime(*hdf["Time"][keys[-1]][...].astype("i2"))
+
+    # 3D fields have the shape (depth, longitude, latitude):
+    #
+    nlayers = [
+        fld["shape"][0] for fld in flds
+        if fld["path"].startswith("Results/") and len(fld["shape"]) == 3
+    ]
+    nlayers = max(nlayers) if nlayers else 1
+
+    # Lagrangian origins are the groups with particle positions:
+    #
+    origins = {}
+    paths = set(fld["path"] for fld in flds)
+
+    for fld in flds:
+        grp, _, name = fld["path"].rpartition("/")
+        if not grp.startswith("Results/"): continue
+        if name in ("Latitude", "Longitude"): continue
+        if grp + "/Latitude" not in paths: continue
+        origins.setdefault(grp[len("Results/"):], []).append(name)
+
+    return {
+        "tstart": tstart, "tend": tend, "nsteps": nsteps,
+        "nlayers": nlayers, "fields": flds, "origins": origins,
+    }
+
+
+def printmeta(hdfin: str, meta: dict):
+    """Prints the metadata of a MOHID HDF5 file.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - meta: metadata returned by getmeta.
+    """
+
+    print(hdfin)
+
+    if meta["tstart"]:
+        print(f"  Time   : {meta['tstart']:%Y-%m-%d %H:%M:%S} to", end=" ")
+        print(f"{meta['tend']:%Y-%m-%d %H:%M:%S} ({meta['nsteps']} steps)")
+
+    print(f"  Layers : {meta['nlayers']}")
+
+    for orig, props in meta["origins"].items():
+        print(f"  Origin : {orig} ({', '.join(props)})")
+
+    print("  Fields :")
+
+    for fld in meta["fields"]:
+        print(f"    {fld['path']}: {fld['steps']} x {fld['shape']}", end=" ")
+        print(f"{fld['dtype']}, chunks={fld['chunks']}", end="")
+        print(f", compression={fld['compression']}")
+
+
+def index(rootdir: str, dbfile: str) -> int:
+    """Indexes all the MOHID HDF5 files of a directory tree into a
+    SQLite catalogue. Files already indexed and not modified since
+    are skipped, files that can't be read are skipped with a warning,
+    and files removed from the tree are removed from the catalogue.
+    Returns the number of files (re)indexed.
+
+    Keyword arguments:
+    - rootdir: path to the root directory;
+    - dbfile: name and path of the catalogue file.
+    """
+
+    if not path.isdir(rootdir):
+        print("[ERROR] m_inspect.index: FileNotFoundError")
+        print(f"\tDirectory not found: '{rootdir}' .")
+        raise SystemExit
+
+    db = sqlite3.connect(dbfile)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+
+    known = {
+        row[0]: (row[1], row[2])
+        for row in db.execute("SELECT path, mtime, size FROM files")
+    }
+    rootdir = path.abspath(rootdir)
+    found = set()
+    count = 0
+
+    for dirpath, _, fnames in walk(rootdir):
+        for fname in fnames:
+            if not fname.lower().endswith(HDFEXT): continue
+
+            fin = path.join(dirpath, fname)
+            stat = (path.getmtime(fin), path.getsize(fin))
+            found.add(fin)
+
+            if known.get(fin) == stat: continue
+
+            # One bad file must not stop the indexing of the others:
+            try:
+                meta = getmeta(fin)
+            except OSError:
+                print(f"[WARNING] m_inspect.index: not a HDF5 file '{fin}'")
+                continue
+            except Exception as err:
+                print(f"[WARNING] m_inspect.index: skipped '{fin}'", end=" ")
+                print(f"({type(err).__name__}: {err})")
+                continue
+
+            db.execute("DELETE FROM files WHERE path = ?", (fin,))
+            cur = db.execute(
+                "INSERT INTO files (path, mtime, size, tstart, tend, "
+                "nsteps, nlayers) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fin, *stat,
+                    meta["tstart"] and meta["tstart"].isoformat(),
+                    meta["tend"] and meta["tend"].isoformat(),
+                    meta["nsteps"], meta["nlayers"],
+                ),
+            )
+            db.executemany(
+                "INSERT INTO fields VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        cur.lastrowid, fld["path"],
+                        fld["path"].rpartition("/")[2], fld["steps"],
+                        str(fld["shape"]), fld["dtype"], str(fld["chunks"]),
+                    )
+                    for fld in meta["fields"]
+                ],
+            )
+            count += 1
+
+            # Commit in batches, so an interrupted run keeps its work:
+            if count % BATCH == 0: db.commit()
+
+    # Remove files that no longer exist under the root directory:
+    #
+    gone = [
+        (fin,) for fin in known
+        if fin.startswith(path.join(rootdir, "")) and fin not in found
+    ]
+    db.executemany("DELETE FROM files WHERE path = ?", gone)
+
+    db.commit()
+    db.close()
+    return count
+
+
+def query(
+    dbfile: str, start: datetime = None, end: datetime = None,
+    field: str = None,
+) -> list:
+    """Searches the catalogue for the files that overlap a time
+    interval and contain a field. Returns a list of tuples with the
+    path, first and last instants of each file.
+
+    Keyword arguments:
+    - dbfile: name and path of the catalogue file;
+    - start, end: limits of the time interval. None for no limit;
+    - field: name (e.g.: 'temperature') or path (e.g.:
+        '/Results/temperature') of a field. None for any field.
+    """
+
+    if not path.isfile(dbfile):
+        print("[ERROR] m_inspect.query: FileNotFoundError")
+        print(f"\tCatalogue not found: '{dbfile}' .")
+        raise SystemExit
+
+    sql = "SELECT path, tstart, tend FROM files WHERE 1"
+    args = []
+
+    # ISO strings sort as the instants they represent:
+    if start:
+        sql += " AND tend >= ?"
+        args.append(start.isoformat())
+    if end:
+        sql += " AND tstart <= ?"
+        args.append(end.isoformat())
+    if field:
+        # Paths are stored without the leading '/':
+        field = field.lstrip("/")
+        sql += " AND id IN (SELECT file FROM fields"
+        sql += " WHERE name = ? OR path = ?)"
+        args += [field, field]
+
+    sql += " ORDER BY tstart, path"
+
+    db = sqlite3.connect(dbfile)
+    rows = db.execute(sql, args).fetchall()
+    db.close()
+    return rows
@@ -0,0 +1,272 @@
+# ###########################################################################
+#
+# File    : m_lagrstats.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Module to compute particle statistics of a Lagrangian origin
+#           of a MOHID HDF5 file: residence time in polygons, arrival
+#           time maps and connectivity matrices between polygons.
+#
+# NOTE    : The time steps are read once, one at a time, so the memory
+#           only grows with the number of particles, never with the
+#           number of steps. Particles are identified by their position
+#           in the arrays of each step (new particles are appended by
+#           MOHID), since the files have no particle IDs.
+#
+# ###########################################################################
+
+from typing import Tuple
+
+import numpy as np
+from matplotlib.path import Path
+
+from m_prefetch import prefetch
+from m_readhdf import getgrid, getTime, iterlagr
+
+
+# Values of the polygon index of the grid cells:
+OUTSIDE = -1
+BORDER = -2
+
+
+def edgecells(
+    lat: np.ndarray, lon: np.ndarray, pth: Path,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Grid cells crossed by the boundary of a polygon, even where no
+    corner of the cell is inside it (e.g.: polygons narrower than a
+    cell). Returns the latitude and longitude indices of the cells.
+
+    Keyword arguments:
+    - lat, lon: grid cell boundaries (see m_readhdf.getgrid);
+    - pth: matplotlib path of the polygon.
+    """
+
+    # Close the polygon, as contains_points does:
+    vert = pth.vertices
+    if not np.array_equal(vert[0], vert[-1]):
+        vert = np.vstack([vert, vert[:1]])
+
+    ilat, ilon = [], []
+
+    for (lon0, lat0), (lon1, lat1) in zip(vert[:-1], vert[1:]):
+        # Positions (0 to 1) where the edge crosses the grid lines:
+        tpar = [np.array([0., 1.])]
+        if lon1 != lon0: tpar.append((lon - lon0) / (lon1 - lon0))
+        if lat1 != lat0: tpar.append((lat - lat0) / (lat1 - lat0))
+        tpar = np.unique(np.concatenate(tpar))
+        tpar = tpar[(tpar >= 0) & (tpar <= 1)]
+
+        # Each piece between crossings is inside one cell. Pieces along
+        # a grid line mark the cells of both sides:
+        tmid = (tpar[:-1] + tpar[1:]) / 2 if len(tpar) > 1 else tpar
+        plon = lon0 + tmid * (lon1 - lon0)
+        plat = lat0 + tmid * (lat1 - lat0)
+
+        for side in ("left", "right"):
+            ilon.append(np.searchsorted(lon, plon, side) - 1)
+            ilat.append(np.searchsorted(lat, plat, side) - 1)
+
+    ilat, ilon = np.concatenate(ilat), np.concatenate(ilon)
+    valid = (ilon >= 0) & (ilon < len(lon)-1)
+    valid &= (ilat >= 0) & (ilat < len(lat)-1)
+    return ilat[valid], ilon[valid]
+
+
+def polyindex(
+    lat: np.ndarray, lon: np.ndarray, paths: list,
+) -> np.ndarray:
+    """Spatial index of the polygons over the model grid. Returns an
+    array with shape (latitude, longitude) with, for each cell, the
+    position of the polygon that contains the whole cell, OUTSIDE if
+    it is outside all polygons or BORDER if a polygon boundary crosses
+    it (particles in those cells need an exact test).
+
+    Keyword arguments:
+    - lat, lon: grid cell boundaries (see m_readhdf.getgrid);
+    - paths: matplotlib paths of the polygons (must not overlap).
+    """
+
+    corners = np.stack(
+        [val.ravel() for val in np.meshgrid(lon, lat)], axis=1,
+    )
+    index = np.full((len(lat)-1, len(lon)-1), OUTSIDE, dtype="i2")
+    border = np.zeros(index.shape, dtype=bool)
+
+    for pos, pth in enumerate(paths):
+        inside = pth.contains_points(corners).reshape(len(lat), len(lon))
+
+        # Number of corners of each cell inside the polygon:
+        count = (
+            inside[:-1, :-1].astype("i1") + inside[1:, :-1]
+            + inside[:-1, 1:] + inside[1:, 1:]
+        )
+        index[count == 4] = pos
+        border |= (count > 0) & (count < 4)
+
+        # Cells crossed by the boundary, with or without corners inside:
+        border[edgecells(lat, lon, pth)] = True
+
+    # Applied last, so no polygon overwrites the border of another:
+    index[border] = BORDER
+    return index
+
+
+def locate(
+    lglat: np.ndarray, lglon: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Grid cells of a set of particles. Returns the latitude and
+    longitude indices and a mask of the particles inside the grid.
+
+    Keyword arguments:
+    - lglat, lglon: particle positions;
+    - lat, lon: grid cell boundaries.
+    """
+
+    ilat = np.searchsorted(lat, lglat) - 1
+    ilon = np.searchsorted(lon, lglon) - 1
+    valid = (ilat >= 0) & (ilat < len(lat)-1)
+    valid &= (ilon >= 0) & (ilon < len(lon)-1)
+    return np.where(valid, ilat, 0), np.where(valid, ilon, 0), valid
+
+
+def regions(
+    lglat: np.ndarray, lglon: np.ndarray, cells: tuple, index: np.ndarray,
+    paths: list,
+) -> np.ndarray:
+    """Polygon of each particle. Returns the position of the polygon
+    or OUTSIDE.
+
+    Keyword arguments:
+    - lglat, lglon: particle positions;
+    - cells: output of locate for the particles;
+    - index: spatial index of the polygons (see polyindex);
+    - paths: matplotlib paths of the polygons.
+    """
+
+    ilat, ilon, valid = cells
+    reg = np.where(valid, index[ilat, ilon], OUTSIDE)
+
+    # Exact test only for the particles in border cells:
+    border = np.flatnonzero(reg == BORDER)
+
+    if len(border):
+        pnts = np.stack([lglon[border], lglat[border]], axis=1)
+        found = np.full(len(border), OUTSIDE, dtype=reg.dtype)
+        for pos, pth in enumerate(paths):
+            found[(found == OUTSIDE) & pth.contains_points(pnts)] = pos
+        reg[border] = found
+
+    return reg
+
+
+def lagrstats(
+    hdfin: str, origin: str, polygons: dict, depth: int = 2,
+) -> dict:
+    """Computes particle statistics of a Lagrangian origin, reading
+    each time step once. Returns a dictionary with the keys:
+    - names: names of the polygons;
+    - count: particles released in each polygon;
+    - connect: number of particles released in polygon i (rows) that
+        entered polygon j (columns) after their release. The diagonal
+        counts the particles that left their polygon and came back;
+    - residence: total time (h) each particle spent in each polygon,
+        with shape (particle, polygon);
+    - arrival: time (h) of the first particle in each grid cell,
+        with shape (latitude, longitude). NaN if never reached;
+    - lat, lon: grid cell boundaries.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - origin: name of the origin (e.g.: 'WWTP');
+    - polygons: dictionary with the name and the [longitude, latitude]
+        vertices of each polygon (up to 64, not overlapping);
+    - depth: time steps read ahead in a child process.
+    """
+
+    names = list(polygons.keys())
+    npoly = len(names)
+
+    if not 0 < npoly <= 64:
+        print("[ERROR] m_lagrstats.lagrstats: ValueError")
+        print("\tBetween 1 and 64 polygons are supported.")
+        raise SystemExit
+
+    paths = [Path(np.array(polygons[name], dtype="f8")) for name in names]
+
+    # Grid, time and spatial index:
+    #
+    dtout = getTime(hdfin)
+    lat, lon = getgrid(hdfin)
+    index = polyindex(lat, lon, paths)
+
+    # Hours since the first step, and the time each step represents
+    # (until the next step, the last one as the previous):
+    hours = np.array([(inst - dtout[0]).total_seconds() for inst in dtout])
+    hours /= 3600
+    dt = np.diff(hours, append=hours[-1]*2 - hours[-2]) if len(hours) > 1 \
+        else np.zeros(1)
+
+    # Accumulators, grown when new particles are released:
+    #
+    source = np.zeros(0, dtype="i2")
+    last = np.zeros(0, dtype="i2")
+    reached = np.zeros(0, dtype="u8")
+    resid = np.zeros((0, npoly), dtype="f4")
+    arrival = np.full(index.shape, np.inf)
+    warned = False
+
+    steps = prefetch(iterlagr, (hdfin, origin), depth)
+
+    for pos, (lglat, lglon, _) in enumerate(steps):
+        size, known = len(lglat), len(source)
+
+        if size < known and not warned:
+            print("[WARNING] m_lagrstats.lagrstats: the number of", end=" ")
+            print("particles decreased. Particle identity is positional.")
+            warned = True
+
+        cells = locate(lglat, lglon, lat, lon)
+        reg = regions(lglat, lglon, cells, index, paths)
+
+        # New particles: their source is the polygon where they are:
+        if size > known:
+            source = np.concatenate([source, reg[known:].astype("i2")])
+            last = np.concatenate([last, reg[known:].astype("i2")])
+            reached = np.concatenate([reached, np.zeros(size-known, "u8")])
+            resid = np.concatenate(
+                [resid, np.zeros((size-known, npoly), "f4")],
+            )
+
+        # Polygons entered since the previous step (not the release
+        # polygon at release) and residence time:
+        inreg = np.flatnonzero(reg >= 0)
+        entered = inreg[reg[inreg] != last[inreg]]
+        bits = np.left_shift(np.uint64(1), reg[entered].astype("u8"))
+        reached[entered] |= bits
+        resid[inreg, reg[inreg]] += dt[pos]
+        last[:size] = reg
+
+        # First arrival in each grid cell:
+        ilat, ilon, valid = cells
+        flat = np.unique(ilat[valid] * index.shape[1] + ilon[valid])
+        arrival.flat[flat] = np.minimum(arrival.flat[flat], hours[pos])
+
+    # Connectivity from the release polygon to each entered polygon:
+    #
+    released = source >= 0
+    count = np.bincount(source[released], minlength=npoly)
+    connect = np.zeros((npoly, npoly), dtype="i8")
+
+    for col in range(npoly):
+        hit = released & ((reached >> np.uint64(col)) & np.uint64(1) > 0)
+        connect[:, col] = np.bincount(source[hit], minlength=npoly)
+
+    arrival[np.isinf(arrival)] = np.nan
+
+    return {
+        "names": names, "count": count, "connect": connect,
+        "residence": resid, "arrival": arrival, "lat": lat, "lon": lon,
+    }
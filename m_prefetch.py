@@ -0,0 +1,114 @@
+# ###########################################################################
+#
+# File    : m_prefetch.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Module to read the next time steps in a child process
+#           while the current one is being plotted.
+#
+# NOTE    : h5py keeps the GIL while it reads, so a reader thread can't
+#           run at the same time as the plotting code. A child process
+#           has its own interpreter, and the steps are sent back through
+#           a bounded queue.
+#
+# ###########################################################################
+
+import pickle
+from multiprocessing import Event, Process, Queue
+from queue import Empty, Full
+from typing import Callable, Iterable, Iterator
+
+
+# Marks the end of the items in the queue:
+END = "END"
+
+
+def reader(func: Callable, args: tuple, queue: Queue, stop: Event):
+    """Runs in the child process: puts the items of func(*args) in
+    the queue, followed by END and the error raised, if any.
+
+    Keyword arguments:
+    - func, args: function that returns the iterable, and its arguments;
+    - queue: bounded queue shared with the main process;
+    - stop: set by the main process when it stops early.
+    """
+
+    def put(val) -> bool:
+        # Wait for space in the queue, unless the consumer stopped:
+        while not stop.is_set():
+            try:
+                queue.put(val, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    try:
+        for item in func(*args):
+            if not put((item, None)): return
+        put((END, None))
+    except BaseException as err:
+        # Errors that can't be sent (pickled) are sent as text:
+        try:
+            pickle.dumps(err)
+        except Exception:
+            err = RuntimeError(f"{type(err).__name__}: {err}")
+        put((END, err))
+
+
+def prefetch(
+    func: Callable[..., Iterable], args: tuple = (), depth: int = 2,
+) -> Iterator:
+    """Iterates func(*args) (e.g.: m_readhdf.iter2Ddata) in a child
+    process, keeping up to 'depth' items ready in a queue. Yields the
+    items in the same order. Errors raised while reading are raised
+    again in the main process.
+
+    Keyword arguments:
+    - func: function that returns an iterable that reads the time
+        steps. Must be defined at module level, so that it can be sent
+        to the child process;
+    - args: arguments of func;
+    - depth: maximum amount of items read ahead. Limits the memory
+        used. 0 reads in the main process (no prefetch).
+    """
+
+    if depth < 1:
+        yield from func(*args)
+        return
+
+    queue = Queue(maxsize=depth)
+    stop = Event()
+    proc = Process(target=reader, args=(func, args, queue, stop), daemon=True)
+    proc.start()
+
+    try:
+        while True:
+            try:
+                item, err = queue.get(timeout=0.5)
+            except Empty:
+                if proc.is_alive(): continue
+                # The child ended without END (e.g.: killed):
+                try:
+                    item, err = queue.get(timeout=0.5)
+                except Empty:
+                    print("[ERROR] m_prefetch.prefetch: RuntimeError")
+                    print(f"\tThe reader process ended ({proc.exitcode}).")
+                    raise SystemExit
+
+            if err is not None: raise err
+            if isinstance(item, str) and item == END: return
+            yield item
+    finally:
+        # The consumer may stop early (e.g.: an error while plotting).
+        # The queue is emptied so the child can finish its last put:
+        stop.set()
+        while proc.is_alive():
+            try:
+                queue.get(timeout=0.1)
+            except Empty:
+                pass
+        proc.join()
@@ -6,12 +6,14 @@
 #
 # Created : 2025 04 25
 #
+# Updated : 2026 10 18
+#
 # Descrp. : Module with functions to extract data from MOHID HDF5 files.
 #
 # ###########################################################################
 
 from datetime import datetime
-from typing import Tuple
+from typing import Iterator, Tuple
 
 import numpy as np
 from h5py import File
@@ -156,3 +158,349 @@ def get2Ddata(hdfin: str, fldgrp: str, layerid: int) -> np.ma.MaskedArray:
 
     # Transpose from (longitude, latitude) to (latitude, longitude):
     return np.transpose(data, (0,2,1))
+
+
+
+def iter2Ddata(
+    hdfin: str, fldgrp: str, layerid: int,
+) -> Iterator[np.ma.MaskedArray]:
+    """Iterates the time steps of a single field at a specific layer,
+    of a MOHID HDF5 file. Same as get2Ddata, but yields one masked
+    array with shape (latitude, longitude) at a time, reading only
+    the selected layer, so the whole field is never in memory.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - fldgrp: path of the HDF5 group to be extracted
+        (e.g.: '/Results/temperature');
+    - layerid: vertical layer index. The first value is zero and at the
+        surface. If the extracted field is 2D this input is ignored.
+    """
+
+    hdf = File(hdfin, "r")
+
+    if fldgrp not in hdf:
+        hdf.close()
+        print("[ERROR] m_readhdf.iter2Ddata: KeyError")
+        print(f"\t'{fldgrp}' is not a group inside the file '{hdfin}'")
+        raise SystemExit
+
+    hdfgrp = hdf[fldgrp]
+    mskgrp = hdf["Grid/OpenPoints"]
+    keys = list(hdfgrp.keys())
+    mkeys = list(mskgrp.keys())
+    nlayers = hdfgrp[keys[0]].shape[0] if hdfgrp[keys[0]].ndim > 2 else 0
+
+    # Check depth dimention:
+    #
+    if nlayers and not (0 <= layerid < nlayers):
+        hdf.close()
+        print("[ERROR] m_readhdf.iter2Ddata: IndexError\n\tThe vertical", end=" ")
+        print(f"dimension of the file '{hdfin}' contains only", end=" ")
+        print(f"{nlayers} layer(s)")
+        raise SystemExit
+
+    try:
+        for key, mkey in zip(keys, mkeys):
+            # MOHID HDF5 files are saved from bottom to surface:
+            dset, mset = hdfgrp[key], mskgrp[mkey]
+            data = dset[nlayers-1-layerid] if nlayers else dset[...]
+            mask = mset[mset.shape[0]-1-layerid] if mset.ndim > 2 else mset[...]
+            mask = mask.astype("i2") < 1
+
+            # Transpose from (longitude, latitude) to (latitude, longitude):
+            yield np.ma.masked_array(data, mask=mask).T
+    finally:
+        hdf.close()
+
+
+def getrange(hdfin: str, fldgrp: str, layerid: int) -> Tuple[float, float]:
+    """Returns the minimum and maximum of a field for all the time
+    steps. MOHID writes them in the 'Minimum' and 'Maximum' attributes
+    of each dataset (for all the layers of 3D fields), so only the
+    metadata is read. Files without them are read one time step at a
+    time, at the specific layer.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - fldgrp: path of the HDF5 group (e.g.: '/Results/temperature');
+    - layerid: vertical layer index (0 at the surface).
+    """
+
+    vmin, vmax = np.inf, -np.inf
+
+    with File(hdfin, "r") as hdf:
+        if fldgrp in hdf:
+            for dset in hdf[fldgrp].values():
+                if "Minimum" not in dset.attrs or "Maximum" not in dset.attrs:
+                    vmin, vmax = np.inf, -np.inf
+                    break
+                vmin = min(vmin, float(np.min(dset.attrs["Minimum"])))
+                vmax = max(vmax, float(np.max(dset.attrs["Maximum"])))
+
+    if vmin <= vmax:
+        return vmin, vmax
+
+    for data in iter2Ddata(hdfin, fldgrp, layerid):
+        if data.count() == 0: continue
+        vmin, vmax = min(vmin, data.min()), max(vmax, data.max())
+
+    return vmin, vmax
+
+
+def iterlagr(
+    hdfin: str, origin: str, prop: str = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Iterates the time steps of a Lagrangian origin of a MOHID HDF5
+    file. Yields the latitude, longitude and property value of the
+    particles of each time step.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - origin: name of the origin (e.g.: 'WWTP');
+    - prop: name of the property (e.g.: 'fecal coliforms'). None to
+        read only the positions (the value is yielded as None).
+    """
+
+    hdf = File(hdfin, "r")
+    hdfgrp = "/Results/" + origin
+
+    grps = [hdfgrp + "/Latitude", hdfgrp + "/Longitude"]
+    if prop is not None: grps.append(hdfgrp + "/" + prop)
+
+    for grp in [hdfgrp] + grps:
+        if grp not in hdf:
+            hdf.close()
+            print("[ERROR] m_readhdf.iterlagr: KeyError")
+            print(f"\t'{grp}' not found in '{hdfin}' .")
+            raise SystemExit
+
+    grps = [hdf[grp] for grp in grps]
+    keys = [list(grp.keys()) for grp in grps]
+
+    try:
+        for step in zip(*keys):
+            vals = [grp[key][...].astype("f8") for grp, key in zip(grps, step)]
+            if prop is None: vals.append(None)
+            yield tuple(vals)
+    finally:
+        hdf.close()
+
+
+def getcells(
+    hdfin: str, points: list,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Finds the grid cells crossed by a polyline, or the cell of a
+    single point. Returns the longitude and latitude indices of the
+    cells and the distance (km) of each cell along the polyline.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - points: list of [longitude, latitude] vertices.
+    """
+
+    lat, lon = getgrid(hdfin)
+    points = np.array(points, dtype="f8").reshape(-1, 2)
+
+    # Cell indices of the vertices (grid arrays are the cell boundaries):
+    ilon = np.searchsorted(lon, points[:, 0]) - 1
+    ilat = np.searchsorted(lat, points[:, 1]) - 1
+
+    if np.any((ilon < 0) | (ilon >= len(lon)-1)) or \
+        np.any((ilat < 0) | (ilat >= len(lat)-1)):
+        print("[ERROR] m_readhdf.getcells: IndexError")
+        print(f"\tPoint(s) outside the grid of the file '{hdfin}'.")
+        raise SystemExit
+
+    # Walk each segment in index space, one cell at a time:
+    #
+    cells = [np.array([[ilon[0], ilat[0]]])]
+
+    for pos in range(1, len(points)):
+        size = max(
+            abs(ilon[pos] - ilon[pos-1]), abs(ilat[pos] - ilat[pos-1]),
+        )
+        frac = np.linspace(0, 1, size+1)[1:, None]
+        step = np.array([ilon[pos-1], ilat[pos-1]]) + frac * np.array(
+            [ilon[pos] - ilon[pos-1], ilat[pos] - ilat[pos-1]]
+        )
+        cells.append(np.round(step).astype("i8"))
+
+    cells = np.concatenate(cells)
+    keep = np.r_[True, np.any(np.diff(cells, axis=0) != 0, axis=1)]
+    ilon, ilat = cells[keep, 0], cells[keep, 1]
+
+    # Distance along the polyline between cell centres (haversine):
+    #
+    clon = np.radians((lon[ilon] + lon[ilon+1]) / 2)
+    clat = np.radians((lat[ilat] + lat[ilat+1]) / 2)
+    hav = np.sin(np.diff(clat)/2)**2
+    hav += np.cos(clat[:-1]) * np.cos(clat[1:]) * np.sin(np.diff(clon)/2)**2
+    dist = np.r_[0, np.cumsum(2 * 6371 * np.arcsin(np.sqrt(hav)))]
+
+    return ilon, ilat, dist
+
+
+def readcells(hdfgrp, ilon: np.ndarray, ilat: np.ndarray) -> np.ndarray:
+    """Reads all the time steps of a 3D field group, already open, at
+    a set of grid cells. Only the HDF5 chunks that contain the cells
+    (or only the cells, if the field is not chunked) are read, never
+    the whole field. Returns an array with shape (time, layer, cell),
+    from the surface to the bottom.
+
+    Keyword arguments:
+    - hdfgrp: h5py group of the field (one dataset per time step);
+    - ilon, ilat: longitude and latitude indices of the cells.
+    """
+
+    keys = list(hdfgrp.keys())
+    dset = hdfgrp[keys[0]]
+    out = np.empty((len(keys), dset.shape[0], len(ilon)), dset.dtype)
+
+    # Datasets not chunked are stored contiguously. Read, for each
+    # longitude row, only the latitudes of the cells in that row
+    # (h5py point selection on one axis):
+    #
+    if not dset.chunks:
+        rows = [
+            (lon, np.flatnonzero(ilon == lon)) for lon in np.unique(ilon)
+        ]
+        rows = [
+            (lon, sel, *np.unique(ilat[sel], return_inverse=True))
+            for lon, sel in rows
+        ]
+
+        for pos, key in enumerate(keys):
+            dset = hdfgrp[key]
+
+            for lon, sel, lats, inv in rows:
+                out[pos][:, sel] = dset[:, lon, lats][:, inv.ravel()]
+
+        # MOHID HDF5 files are saved from bottom to surface:
+        return out[:, ::-1]
+
+    # Tiles to read: the chunks that contain the cells:
+    #
+    tsize = dset.chunks[1:]
+    tlon, tlat = ilon // tsize[0], ilat // tsize[1]
+    tiles = np.unique(np.stack([tlon, tlat], axis=1), axis=0)
+
+    for pos, key in enumerate(keys):
+        dset = hdfgrp[key]
+
+        for tile in tiles:
+            sel = (tlon == tile[0]) & (tlat == tile[1])
+            lon0, lat0 = tile[0]*tsize[0], tile[1]*tsize[1]
+            blk = dset[:, lon0:lon0+tsize[0], lat0:lat0+tsize[1]]
+            out[pos][:, sel] = blk[:, ilon[sel]-lon0, ilat[sel]-lat0]
+
+    # MOHID HDF5 files are saved from bottom to surface:
+    return out[:, ::-1]
+
+
+def getcolumns(
+    hdfin: str, fldgrp: str, ilon: np.ndarray, ilat: np.ndarray,
+) -> np.ma.MaskedArray:
+    """Extracts all the time steps and layers of a 3D field at a set
+    of grid cells (see readcells). Returns a masked array with shape
+    (time, layer, cell), from the surface to the bottom.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - fldgrp: path of the HDF5 group to be extracted
+        (e.g.: '/Results/salinity');
+    - ilon, ilat: longitude and latitude indices of the cells.
+    """
+
+    hdf = File(hdfin, "r")
+
+    if fldgrp not in hdf:
+        hdf.close()
+        print("[ERROR] m_readhdf.getcolumns: KeyError")
+        print(f"\t'{fldgrp}' is not a group inside the file '{hdfin}'")
+        raise SystemExit
+
+    hdfgrp = hdf[fldgrp]
+
+    if hdfgrp[list(hdfgrp.keys())[0]].ndim != 3:
+        hdf.close()
+        print("[ERROR] m_readhdf.getcolumns: IndexError")
+        print(f"\t'{fldgrp}' is not a 3D field of the file '{hdfin}'")
+        raise SystemExit
+
+    data = readcells(hdfgrp, ilon, ilat)
+
+    # Land/sea mask (in MOHID HDFs 1=water,0=land):
+    if "Grid/OpenPoints" in hdf:
+        mask = readcells(hdf["Grid/OpenPoints"], ilon, ilat)
+        mask = mask.astype("i2") < 1
+    else:
+        mask = np.zeros(data.shape, dtype=bool)
+
+    hdf.close()
+    return np.ma.masked_array(data, mask=mask)
+
+
+def getdepth(
+    hdfin: str, ilon: np.ndarray, ilat: np.ndarray,
+) -> np.ndarray:
+    """Extracts the depth (m) of the layer centres at a set of grid
+    cells, from the group '/Grid/VerticalZ'. Returns an array with
+    shape (time, layer, cell), from the surface to the bottom, or None
+    if the file has no vertical grid.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - ilon, ilat: longitude and latitude indices of the cells.
+    """
+
+    hdf = File(hdfin, "r")
+
+    if "Grid/VerticalZ" not in hdf:
+        hdf.close()
+        return None
+
+    # VerticalZ has the depth of the layer faces (one more than layers):
+    faces = readcells(hdf["Grid/VerticalZ"], ilon, ilat).astype("f8")
+    hdf.close()
+    return (faces[:, :-1] + faces[:, 1:]) / 2
+
+
+def getsection(
+    hdfin: str, fldgrp: str, points: list,
+) -> Tuple[np.ma.MaskedArray, np.ndarray, np.ndarray]:
+    """Extracts a vertical section of a field along a polyline, for
+    all the time steps. Returns the field with shape (time, layer,
+    cell), the depth of the layers with the same shape (or None) and
+    the distance (km) of each cell along the polyline.
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - fldgrp: path of the HDF5 group to be extracted
+        (e.g.: '/Results/salinity');
+    - points: list of [longitude, latitude] vertices.
+    """
+
+    ilon, ilat, dist = getcells(hdfin, points)
+    data = getcolumns(hdfin, fldgrp, ilon, ilat)
+    depth = getdepth(hdfin, ilon, ilat)
+    return data, depth, dist
+
+
+def getprofile(
+    hdfin: str, fldgrp: str, lon: float, lat: float,
+) -> Tuple[np.ma.MaskedArray, np.ndarray]:
+    """Extracts the vertical profile of a field at a point, for all
+    the time steps. Returns the field with shape (time, layer) and the
+    depth of the layers with the same shape (or None).
+
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - fldgrp: path of the HDF5 group to be extracted
+        (e.g.: '/Results/salinity');
+    - lon, lat: longitude and latitude of the point.
+    """
+
+    data, depth, _ = getsection(hdfin, fldgrp, [[lon, lat]])
+    if depth is not None: depth = depth[:, :, 0]
+    return data[:, :, 0], depth
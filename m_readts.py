@@ -0,0 +1,285 @@
+# ###########################################################################
+#
+# File    : m_readts.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Module with functions to read MOHID time series files
+#           (.srh, .srw, ...) and to merge many of them in one table.
+#
+# ###########################################################################
+
+import mmap
+from datetime import datetime
+from os import path
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+
+# MOHID time series files have the following structure:
+#
+# Time Serie Results File
+# NAME                    : 21_29_1
+# LOCALIZATION_I          : -999999
+#  SERIE_INITIAL_DATA      : 2023.  3.  6.  0.  0.  0.0
+#  COORD_X    : -8.53392900000000
+#       Seconds   YY  MM  DD  hh  mm       ss       salinity ...
+# <BeginTimeSerie>
+#          0.00 2023   3   6   0   0   0.0000      0.36E+002 ...
+# <EndTimeSerie>
+# <BeginResidual>
+#     259200.00 2023   3   9   0   0   0.0000      0.55E+001 ...
+# <EndResidual>
+#
+# The first seven columns are the time (seconds since the initial date
+# and the date), and the others are the fields.
+
+TIMECOLS = ("Seconds", "YY", "MM", "DD", "hh", "mm", "ss")
+
+# Size (bytes) of the slices of a block parsed at once:
+SLICE = 2**24
+
+# Types of the numeric header keywords. The others are kept as strings:
+HEADTYPES = {
+    "LOCALIZATION_I": int, "LOCALIZATION_J": int, "LOCALIZATION_K": int,
+    "COORD_X": float, "COORD_Y": float,
+}
+
+
+class TimeSerie(NamedTuple):
+    """Contents of a MOHID time series file."""
+
+    # Header keywords (e.g.: 'NAME', 'COORD_X'), with typed values:
+    header: dict
+    # Names of the fields (without the time columns):
+    columns: Tuple[str]
+    # Seconds since SERIE_INITIAL_DATA, shape (time,):
+    seconds: np.ndarray
+    # Instants as numpy datetime64[ms], shape (time,):
+    time: np.ndarray
+    # Fields, shape (time, field):
+    data: np.ndarray
+    # Residual values of the fields, shape (field,), or None:
+    residual: np.ndarray
+
+
+def headval(key: str, val: str):
+    """Converts the value of a header keyword to its type.
+
+    Keyword arguments:
+    - key: name of the keyword;
+    - val: value of the keyword as written in the file.
+    """
+
+    if key == "SERIE_INITIAL_DATA":
+        vals = [float(num) for num in val.split()]
+        sec = vals[5]
+        return datetime(
+            *[int(num) for num in vals[:5]], int(sec),
+            int(round((sec - int(sec)) * 1e6)),
+        )
+
+    typ = HEADTYPES.get(key, str)
+
+    try:
+        return typ(val)
+    except ValueError:
+        return val
+
+
+def readheader(tsfile: str) -> Tuple[dict, Tuple[str]]:
+    """Reads the header of a MOHID time series file. Returns the
+    header keywords and the names of all the columns.
+
+    Keyword argument:
+    - tsfile: name and path of the MOHID time series file.
+    """
+
+    if not path.isfile(tsfile):
+        print("[ERROR] m_readts.readheader: FileNotFoundError")
+        print(f"\tTime series file not found: '{tsfile}' .")
+        raise SystemExit
+
+    header = {}
+    columns = ()
+
+    with open(tsfile, "r") as dat:
+        for line in dat:
+            if "<BeginTimeSerie>" in line:
+                break
+            if "YY  MM  DD  hh  mm" in line:
+                columns = tuple(line.split())
+            elif ":" in line:
+                key, _, val = line.partition(":")
+                header[key.strip()] = headval(key.strip(), val.strip())
+
+    if not columns:
+        print("[ERROR] m_readts.readheader: RuntimeError")
+        print(f"\tFields row not found in TS file '{tsfile}'.")
+        raise SystemExit
+
+    return header, columns
+
+
+def readblock(
+    tsfile: str, begin: bytes, end: bytes, ncols: int,
+) -> np.ndarray:
+    """Reads a numeric block of a MOHID time series file into an
+    array with shape (rows, ncols). The file is memory mapped and the
+    block is parsed by numpy in slices of whole lines (SLICE bytes),
+    without splitting lines in Python, so only one slice of the text
+    is copied to memory at a time. Returns None if the block is not
+    found.
+
+    Keyword arguments:
+    - tsfile: name and path of the MOHID time series file;
+    - begin, end: block markers (e.g.: b'<BeginTimeSerie>');
+    - ncols: number of columns of the block.
+    """
+
+    with open(tsfile, "rb") as dat:
+        with mmap.mmap(dat.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+            low = mem.find(begin)
+            upp = mem.find(end, low)
+            if low < 0 or upp < 0: return None
+
+            low += len(begin)
+            parts = []
+
+            try:
+                while low < upp:
+                    # Cut the slice at the end of a line:
+                    cut = upp
+                    if upp - low > SLICE:
+                        cut = mem.rfind(b"\n", low, low + SLICE) + 1 or upp
+                    parts.append(np.fromstring(mem[low:cut], sep=" "))
+                    low = cut
+                data = np.concatenate(parts) if parts else np.zeros(0)
+            except ValueError:
+                data = None
+
+    if data is None or data.size % ncols:
+        print("[ERROR] m_readts.readblock: RuntimeError")
+        print(f"\tBad values in the block {begin.decode()} of '{tsfile}'.")
+        raise SystemExit
+
+    return data.reshape(-1, ncols)
+
+
+def readts(tsfile: str) -> TimeSerie:
+    """Reads a MOHID time series file: header, series and residuals.
+
+    Keyword argument:
+    - tsfile: name and path of the MOHID time series file.
+    """
+
+    header, columns = readheader(tsfile)
+    ncols = len(columns)
+
+    data = readblock(tsfile, b"<BeginTimeSerie>", b"<EndTimeSerie>", ncols)
+
+    if data is None:
+        print("[ERROR] m_readts.readts: RuntimeError")
+        print(f"\tTime series block not found in '{tsfile}'.")
+        raise SystemExit
+
+    resid = readblock(tsfile, b"<BeginResidual>", b"<EndResidual>", ncols)
+    if resid is not None and len(resid): resid = resid[-1, len(TIMECOLS):]
+    else: resid = None
+
+    # Instants from the date columns. Seconds are kept to the millisecond:
+    #
+    date = data[:, 1:7]
+    time = (
+        (date[:, 0] - 1970).astype("i8").astype("datetime64[Y]")
+        + (date[:, 1] - 1).astype("i8").astype("timedelta64[M]")
+    ).astype("datetime64[ms]")
+    time += (date[:, 2] - 1).astype("i8").astype("timedelta64[D]")
+    time += np.round(
+        (date[:, 3]*3600 + date[:, 4]*60 + date[:, 5]) * 1000
+    ).astype("i8").astype("timedelta64[ms]")
+
+    return TimeSerie(
+        header=header,
+        columns=columns[len(TIMECOLS):],
+        seconds=data[:, 0].copy(),
+        time=time,
+        data=np.ascontiguousarray(data[:, len(TIMECOLS):]),
+        residual=resid,
+    )
+
+
+def alignts(
+    series: dict, column: str = None,
+) -> Tuple[np.ndarray, Tuple[str], np.ndarray]:
+    """Aligns one field of many MOHID time series, already read, in a
+    table with one column for each station. Series with the same
+    station NAME (e.g.: consecutive run segments) are joined, and
+    where they overlap the values of the later series are kept.
+    Instants missing in a station are NaN. Returns the instants
+    (datetime64), the station names and the table with shape
+    (time, station).
+
+    Keyword arguments:
+    - series: dictionary with the name and path of each file and its
+        TimeSerie (see readts), in order;
+    - column: name of the field. Can be None if the series have
+        only one field.
+    """
+
+    names, stats, times, vals = [], [], [], []
+
+    for tsfile, tsr in series.items():
+        col = column
+
+        if col is None and len(tsr.columns) == 1:
+            col = tsr.columns[0]
+
+        if col not in tsr.columns:
+            print("[ERROR] m_readts.alignts: KeyError")
+            print(f"\tField '{col}' not found in '{tsfile}'.")
+            raise SystemExit
+
+        name = str(tsr.header.get(
+            "NAME", path.splitext(path.basename(tsfile))[0]
+        ))
+        if name not in names: names.append(name)
+
+        stats.append(np.full(len(tsr.time), names.index(name)))
+        times.append(tsr.time)
+        vals.append(tsr.data[:, tsr.columns.index(col)])
+
+    stats = np.concatenate(stats)
+    times = np.concatenate(times)
+    vals = np.concatenate(vals)
+
+    # Common time axis and the row of each value:
+    time, rows = np.unique(times, return_inverse=True)
+
+    # Keep the last value of each (time, station) pair:
+    cell = rows * len(names) + stats
+    _, last = np.unique(cell[::-1], return_index=True)
+    last = len(cell) - 1 - last
+
+    table = np.full((len(time), len(names)), np.nan)
+    table[rows[last], stats[last]] = vals[last]
+
+    return time, tuple(names), table
+
+
+def mergets(
+    tsfiles: list, column: str = None,
+) -> Tuple[np.ndarray, Tuple[str], np.ndarray]:
+    """Reads many MOHID time series files and aligns one of their
+    fields in one table (see alignts).
+
+    Keyword arguments:
+    - tsfiles: names and paths of the MOHID time series files;
+    - column: name of the field. Can be None if the files have
+        only one field.
+    """
+
+    return alignts({tsfile: readts(tsfile) for tsfile in tsfiles}, column)
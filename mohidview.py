@@ -0,0 +1,338 @@
+# ###########################################################################
+#
+# File    : mohidview.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Command line entry point for the programs of the package.
+#
+# NOTE    : Only the standard library is imported at module level. The
+#           heavy modules (numpy, h5py, matplotlib, ...) are imported by
+#           each subcommand, so listing fields or checking the inputs
+#           does not pay for them.
+#
+# ###########################################################################
+
+from argparse import Action, ArgumentParser, BooleanOptionalAction, Namespace
+from os import environ
+
+from m_inputs import FINIT
+
+
+def run_hdf(args: Namespace):
+    from p_plotHDF import main
+
+    over = {
+        "hdf": args.hdf, "outdir": args.outdir, "prefix": args.prefix,
+        "field": args.field, "layer": args.layer, "vectors": args.vectors,
+        "cmap": args.cmap, "label": args.label, "levels": args.levels,
+        "vmin": args.vmin, "vmax": args.vmax, "prefetch": args.prefetch,
+    }
+
+    if args.check:
+        from m_inputs import init_plotHDF
+        init_plotHDF(args.init, over)
+        print("[OK] HDF inputs")
+        return
+
+    main(args.init, over)
+
+
+def run_lagr(args: Namespace):
+    from p_plotLAGR import main
+
+    over = {
+        "hdf": args.hdf, "outdir": args.outdir,
+        "origin_name": args.origin, "propertie_name": args.prop,
+        "cmap": args.cmap, "label": args.label, "levels": args.levels,
+        "vmax": args.vmax, "vmin": args.vmin, "prefetch": args.prefetch,
+    }
+
+    if args.check:
+        from m_inputs import init_plotLAGR
+        init_plotLAGR(args.init, over)
+        print("[OK] LAGR inputs")
+        return
+
+    main(args.init, over)
+
+
+def run_lagrstats(args: Namespace):
+    from p_statsLAGR import main
+
+    over = {
+        "hdf": args.hdf, "outdir": args.outdir, "origin_name": args.origin,
+        "prefetch": args.prefetch,
+    }
+
+    if args.check:
+        from m_inputs import init_statsLAGR
+        init_statsLAGR(args.init, over)
+        print("[OK] LAGRSTATS inputs")
+        return
+
+    main(args.init, over)
+
+
+def run_ts(args: Namespace):
+    from p_plotTS import batch, main
+
+    if args.batch:
+        batch(args.batch, args.columns, args.outdir, args.downsample,
+              args.workers)
+        return
+
+    over = {"tsfile": args.tsfile}
+
+    if args.merge:
+        from m_inputs import init_plotTS
+        from p_plotTS import merge
+        column = args.columns[0] if args.columns else None
+        merge(init_plotTS(args.init, over), column, args.merge)
+        return
+
+    if args.check:
+        from m_inputs import init_plotTS
+        init_plotTS(args.init, over)
+        print("[OK] TS inputs")
+        return
+
+    main(args.init, over, args.downsample)
+
+
+def run_vert(args: Namespace):
+    from p_plotVERT import main
+
+    over = {
+        "hdf": args.hdf, "outdir": args.outdir, "prefix": args.prefix,
+        "field": args.field, "mode": args.mode, "points": args.points,
+        "cmap": args.cmap, "label": args.label, "levels": args.levels,
+    }
+
+    if args.check:
+        from m_inputs import init_plotVERT
+        init_plotVERT(args.init, over)
+        print("[OK] VERT inputs")
+        return
+
+    main(args.init, over)
+
+
+def run_inspect(args: Namespace):
+    from datetime import datetime
+    
+    import m_inspect
+
+    # Index a directory tree:
+    if args.index:
+        count = m_inspect.index(args.index, args.db)
+        print(f"{count} file(s) indexed into '{args.db}'")
+        return
+
+    # Inspect one file:
+    if args.hdf:
+        m_inspect.printmeta(args.hdf, m_inspect.getmeta(args.hdf))
+        return
+
+    # Query the catalogue:
+    start = args.start and datetime.fromisoformat(args.start)
+    end = args.end and datetime.fromisoformat(args.end)
+
+    for fin, tstart, tend in m_inspect.query(args.db, start, end, args.field):
+        print(f"{fin}\t{tstart}\t{tend}")
+
+
+def run_stats(args: Namespace):
+    from m_inputs import init_statsHDF
+
+    over = {"hdf": args.hdf, "field": args.field, "layer": args.layer}
+    inpts = init_statsHDF(args.init, over)
+
+    if args.check:
+        print("[OK] stats inputs")
+        return
+
+    from m_readhdf import getTime, iter2Ddata
+
+    hdf = inpts.get("hdf")
+    dtout = getTime(hdf)
+    steps = iter2Ddata(hdf, "Results/" + inpts.get("field"), inpts.get("layer"))
+
+    # Output as CSV so it can be piped. One time step in memory at once,
+    # and the header only after the field is found:
+    for pos, (inst, step) in enumerate(zip(dtout, steps)):
+        if pos == 0: print("time,min,max,mean")
+        print(f"{inst:%Y-%m-%dT%H:%M:%S},", end="")
+        print(f"{step.min()},{step.max()},{step.mean()}")
+
+
+class PointsAction(Action):
+    """Groups a flat list of numbers in [longitude, latitude] pairs."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if len(values) % 2:
+            parser.error(f"{option_string} expects LON LAT pairs")
+        pnts = [list(values[pos:pos+2]) for pos in range(0, len(values), 2)]
+        setattr(namespace, self.dest, pnts)
+
+
+def parser() -> ArgumentParser:
+    """Creates the command line parser of mohidview."""
+
+    prs = ArgumentParser(
+        prog="mohidview",
+        description="Plot and inspect MOHID HDF5 and time series files.",
+    )
+    prs.add_argument(
+        "--init", default=FINIT,
+        help=f"initialization file (default: {FINIT})",
+    )
+    prs.add_argument(
+        "--backend", default=None,
+        help="matplotlib backend (default: Agg, except for interactive 'ts')",
+    )
+    sub = prs.add_subparsers(dest="cmd", required=True)
+
+    # HDF fields:
+    cmd = sub.add_parser("hdf", help="plot a field of a MOHID HDF5 file")
+    cmd.add_argument("--hdf")
+    cmd.add_argument("--outdir")
+    cmd.add_argument("--prefix")
+    cmd.add_argument("--field")
+    cmd.add_argument("--layer", type=int)
+    cmd.add_argument("--vectors", action=BooleanOptionalAction,
+                     help="draw (or not) the velocity vectors")
+    cmd.add_argument("--cmap")
+    cmd.add_argument("--label")
+    cmd.add_argument("--levels", type=int)
+    cmd.add_argument("--vmin", type=float)
+    cmd.add_argument("--vmax", type=float)
+    cmd.add_argument("--prefetch", type=int, metavar="N",
+                     help="time steps read ahead (default: 2, 0 = off)")
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_hdf)
+
+    # Lagrangian particles:
+    cmd = sub.add_parser("lagr", help="plot MOHID lagrangian particles")
+    cmd.add_argument("--hdf")
+    cmd.add_argument("--outdir")
+    cmd.add_argument("--origin")
+    cmd.add_argument("--prop")
+    cmd.add_argument("--cmap")
+    cmd.add_argument("--label")
+    cmd.add_argument("--levels", type=int)
+    cmd.add_argument("--vmax", type=float)
+    cmd.add_argument("--vmin", type=float)
+    cmd.add_argument("--prefetch", type=int, metavar="N",
+                     help="time steps read ahead (default: 2, 0 = off)")
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_lagr)
+
+    # Lagrangian statistics:
+    cmd = sub.add_parser(
+        "lagrstats",
+        help="residence, arrival time and connectivity of particles",
+    )
+    cmd.add_argument("--hdf")
+    cmd.add_argument("--outdir")
+    cmd.add_argument("--origin")
+    cmd.add_argument("--prefetch", type=int, metavar="N",
+                     help="time steps read ahead (default: 2, 0 = off)")
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_lagrstats)
+
+    # Time series:
+    cmd = sub.add_parser("ts", help="plot a MOHID time series file")
+    cmd.add_argument("--tsfile", nargs="+",
+                     help="one or more files (stations or run segments)")
+    cmd.add_argument("--merge", metavar="CSV",
+                     help="save one field of the files in one table (CSV)")
+    cmd.add_argument("--downsample", default="lttb",
+                     choices=("lttb", "minmax", "none"),
+                     help="line downsampling method (default: lttb)")
+    cmd.add_argument("--batch", nargs="+", metavar="TSFILE",
+                     help="save the figures of many files, no questions")
+    cmd.add_argument("--columns", nargs="+", default=[],
+                     help="batch: fields to plot (default: all). merge: field")
+    cmd.add_argument("--outdir", default=".",
+                     help="batch: output directory (default: .)")
+    cmd.add_argument("--workers", type=int,
+                     help="batch: number of processes (default: CPUs)")
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_ts)
+
+    # Vertical sections and profiles:
+    cmd = sub.add_parser(
+        "vert", help="plot vertical sections or profiles of a HDF5 field",
+    )
+    cmd.add_argument("--hdf")
+    cmd.add_argument("--outdir")
+    cmd.add_argument("--prefix")
+    cmd.add_argument("--field")
+    cmd.add_argument("--mode", choices=("section", "profile"))
+    cmd.add_argument("--points", type=float, nargs="+",
+                     metavar="LON LAT", action=PointsAction,
+                     help="polyline (section) or point (profile)")
+    cmd.add_argument("--cmap")
+    cmd.add_argument("--label")
+    cmd.add_argument("--levels", type=int)
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_vert)
+
+    # Metadata:
+    cmd = sub.add_parser(
+        "inspect", help="inspect HDF5 files and query the catalogue",
+    )
+    cmd.add_argument("hdf", nargs="?", help="HDF5 file to inspect")
+    cmd.add_argument("--db", default="mohidview.sqlite",
+                     help="catalogue file (default: mohidview.sqlite)")
+    cmd.add_argument("--index", metavar="DIR",
+                     help="index the HDF5 files of a directory tree")
+    cmd.add_argument("--start", help="query: ISO date (e.g. 2023-03-06)")
+    cmd.add_argument("--end", help="query: ISO date")
+    cmd.add_argument("--field", help="query: field name or path")
+    cmd.set_defaults(func=run_inspect)
+
+    # Field statistics:
+    cmd = sub.add_parser("stats", help="min/max/mean of a field per step")
+    cmd.add_argument("--hdf")
+    cmd.add_argument("--field")
+    cmd.add_argument("--layer", type=int)
+    cmd.add_argument("--check", action="store_true",
+                     help="only check the inputs")
+    cmd.set_defaults(func=run_stats)
+
+    return prs
+
+
+def main(argv: list = None):
+    args = parser().parse_args(argv)
+
+    # Figures are saved to files, so use a non-interactive backend,
+    # unless the user asks otherwise. The time series program shows
+    # the charts on screen and keeps the matplotlib default.
+    #
+    if args.backend:
+        environ["MPLBACKEND"] = args.backend
+    elif args.cmd != "ts" or args.batch:
+        environ.setdefault("MPLBACKEND", "Agg")
+
+    # The modules stop on errors with a bare SystemExit (exit status 0).
+    # Exit with 1, so scripts and --check can tell failure from success:
+    #
+    try:
+        args.func(args)
+    except SystemExit as exc:
+        if exc.code is None: raise SystemExit(1)
+        raise
+
+
+if __name__ == "__main__":
+    main()
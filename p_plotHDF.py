@@ -6,7 +6,7 @@
 #
 # Created : 2025 04 26
 #
-# Updated : 2025 05 06
+# Updated : 2026 10 18
 #
 # Descrp. : Program to plot a field of a MOHID HDF5 file.
 #
@@ -15,19 +15,40 @@
 from glob import glob
 from os import path
 
-import imageio.v3 as iio
-import numpy as np
-from matplotlib import axes, colors
-from matplotlib import pyplot as plt
+from m_inputs import FINIT, init_plotHDF
 
-from m_inputs import init_plotHDF
-from m_readhdf import get2Ddata, getgrid, getTime
 
+def readsteps(hdf: str, fld: str, layer: int, vectors: bool):
+    """Iterates the time steps of a field and, if asked, of the velocity
+    components, at a specific layer. Yields (field, u, v) tuples, with
+    None for the velocity without vectors. Runs in the prefetch process
+    (see m_prefetch).
 
-def main():
+    Keyword arguments:
+    - hdf: name and path of the MOHID HDF5 file;
+    - fld: name of the field (e.g.: 'temperature');
+    - layer: vertical layer index (0 at the surface);
+    - vectors: also read 'velocity U' and 'velocity V'.
+    """
+
+    from m_readhdf import iter2Ddata
+
+    steps = iter2Ddata(hdf, "Results/" + fld, layer)
+
+    if not vectors:
+        return ((data, None, None) for data in steps)
+
+    return zip(
+        steps,
+        iter2Ddata(hdf, "Results/velocity U", layer),
+        iter2Ddata(hdf, "Results/velocity V", layer),
+    )
+
+
+def main(fipt: str = FINIT, over: dict = None):
     # Inputs:
     #
-    inpts = init_plotHDF()
+    inpts = init_plotHDF(fipt, over)
 
     hdf = inpts.get("hdf")
     outdir = inpts.get("outdir")
@@ -42,23 +63,44 @@ def main():
     label = inpts.get("label")
     levels = inpts.get("levels")
     timestr = inpts.get("timestr")
+    vmin, vmax = inpts.get("vmin"), inpts.get("vmax")
+    depth = inpts.get("prefetch", 2)
 
     del inpts
 
-    # Get data from HDF file:
+    # The plotting modules are only imported after the inputs are
+    # checked, so that wrong inputs fail fast:
+    #
+    import imageio.v3 as iio
+    import numpy as np
+    from matplotlib import axes, colors
+    from matplotlib import pyplot as plt
+
+    from m_prefetch import prefetch
+    from m_readhdf import getgrid, getrange, getTime
+
+    # Get grid and time from HDF file:
     #
-    data = get2Ddata(hdf, "Results/" + fld, layer)
     lat, lon = getgrid(hdf)
     dtout = getTime(hdf)
-    
-    if vectors:
-        vx = get2Ddata(hdf, "Results/velocity U", layer)
-        vy = get2Ddata(hdf, "Results/velocity V", layer)
+
+    # The color scale needs the range of all the time steps. Without
+    # 'vmin' and 'vmax' in the inputs, it comes from the 'Minimum' and
+    # 'Maximum' attributes of the file, or from one more reading:
+    #
+    if vmin is None or vmax is None:
+        fmin, fmax = getrange(hdf, "Results/" + fld, layer)
+        if vmin is None: vmin = fmin
+        if vmax is None: vmax = fmax
+
+    # Time steps are read in a child process, up to 'prefetch' steps
+    # ahead, while the current one is being plotted:
+    #
+    steps = prefetch(readsteps, (hdf, fld, layer, vectors), depth)
 
     # Set plots elements:
     #
     lonx, laty = lon[:-1], lat[:-1]
-    vmax, vmin = data.max(), data.min()
     bounds = np.linspace(vmin, vmax, levels)
     if vectors: xax, yax = np.meshgrid(lonx, laty)
 
@@ -66,7 +108,7 @@ def main():
     # iteration for better RAM management and to enable the
     # plot of different colorbars.
     #
-    for pos, inst in enumerate(dtout):
+    for inst, (data, vx, vy) in zip(dtout, steps):
         fout = path.join(outdir, prefix + inst.strftime("%Y%m%dT%H%M.png"))
         print(fout)
 
@@ -82,7 +124,7 @@ def main():
         norm = colors.BoundaryNorm(
             boundaries=bounds, ncolors=256, extend="both",
         )
-        pcm = ax.pcolormesh(lonx, laty, data[pos], norm=norm, cmap=cmap)
+        pcm = ax.pcolormesh(lonx, laty, data, norm=norm, cmap=cmap)
 
         # NOTE: improve plot with cartopy.
 
@@ -90,8 +132,8 @@ def main():
             ax.quiver(
                 xax[::vec_zoom, ::vec_zoom],
                 yax[::vec_zoom, ::vec_zoom],
-                vx[pos][::vec_zoom, ::vec_zoom],
-                vy[pos][::vec_zoom, ::vec_zoom],
+                vx[::vec_zoom, ::vec_zoom],
+                vy[::vec_zoom, ::vec_zoom],
                 scale=10, width=0.002,
             )
             
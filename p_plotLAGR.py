@@ -6,7 +6,7 @@
 #
 # Created : 2025 04 29
 #
-# Updated : 2025 05 06 - Fernando Mendonça (CIMA UAlg)
+# Updated : 2026 10 18 - Fernando Mendonça (CIMA UAlg)
 #
 # Descrp. : Program to plot a Lagrangian field of a MOHID HDF5 file.
 #
@@ -17,20 +17,33 @@
 from glob import glob
 from os import path
 
-import imageio.v3 as iio
-import matplotlib.pyplot as plt
-import numpy as np
-from h5py import File
-from matplotlib import axes, colors
+from m_inputs import FINIT, init_plotLAGR
 
-from m_inputs import init_plotLAGR
-from m_readhdf import getbatim, getgrid, getTime
 
+def readsteps(hdfin: str, origin: str, prop: str, vmin: float):
+    """Iterates the time steps of a Lagrangian origin, without the
+    particles with a property value below vmin. Yields the latitude,
+    longitude and property value of the particles. Runs in the prefetch
+    process (see m_prefetch).
 
-def main():
+    Keyword arguments:
+    - hdfin: name and path of the MOHID HDF5 file;
+    - origin: name of the origin (e.g.: 'WWTP');
+    - prop: name of the property (e.g.: 'concentration');
+    - vmin: minimum property value.
+    """
+
+    from m_readhdf import iterlagr
+
+    for lglat, lglon, lgdata in iterlagr(hdfin, origin, prop):
+        mask = lgdata >= vmin
+        yield lglat[mask], lglon[mask], lgdata[mask]
+
+
+def main(fipt: str = FINIT, over: dict = None):
     # Inputs:
     #
-    inpts = init_plotLAGR()
+    inpts = init_plotLAGR(fipt, over)
     
     hdfin = inpts.get("hdf")
     outdir = inpts.get("outdir")
@@ -42,9 +55,22 @@ def main():
     levels = inpts.get("levels")
     vmax, vmin = inpts.get("vmax"), inpts.get("vmin")
     timestr = inpts.get("timestr")
+    depth = inpts.get("prefetch", 2)
 
     del inpts
 
+    # The plotting modules are only imported after the inputs are
+    # checked, so that wrong inputs fail fast:
+    #
+    import imageio.v3 as iio
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from h5py import File
+    from matplotlib import axes, colors
+
+    from m_prefetch import prefetch
+    from m_readhdf import getbatim, getgrid, getTime
+
     # Check lagrangian inputs:
     # 
     hdf = File(hdfin, "r")
@@ -79,33 +105,23 @@ def main():
     # Make all water cells as 1 and land cells 0:
     batim = (batim/batim).astype("i2")
     
+    # Read lagrangian data (latitude, longitude, concentration) and
+    # remove particles with insignificant concentration. The steps are
+    # read in a child process, up to 'prefetch' steps ahead:
+    #
+    steps = prefetch(
+        readsteps, (hdfin, origin_name, propertie_name, vmin), depth,
+    )
+
     # Iterate time steps:
     #
     bounds = np.linspace(vmin, vmax, levels)
-    hdf = File(hdfin, "r")
 
-    for pos, inst in enumerate(dtout):
+    for inst, (lglat, lglon, lgdata) in zip(dtout, steps):
         # Output file:
         fout = path.join(outdir, origin_name)
         fout+= inst.strftime("-%Y%m%dT%H%M.png")
         print(fout)
-
-        # Read lagrangian data (latitude, longitude, concentration):
-        grp = hdf[hdfgrp + "/Latitude"]
-        key = [key for key in grp.keys()][pos]
-        lglat = grp[key][...].astype("f8")
-
-        grp = hdf[hdfgrp + "/Longitude"]
-        key = [key for key in grp.keys()][pos]
-        lglon = grp[key][...].astype("f8")
-
-        grp = hdf[grpfld]
-        key = [key for key in grp.keys()][pos]
-        lgdata = grp[key][...].astype("f8")
-
-        # Remove particles with insignificant concentration:
-        mask = lgdata >= vmin
-        lglon, lglat, lgdata = lglon[mask], lglat[mask], lgdata[mask]
         
         # Create time step figure:
         fig, ax = plt.subplots()
@@ -130,8 +146,6 @@ def main():
         # Save figure:
         fig.savefig(fout, dpi=600)
         plt.close(fig)
-    
-    hdf.close()
 
     # Make animation:
     #
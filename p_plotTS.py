@@ -6,95 +6,194 @@
 #
 # Created : 2025 04 27
 #
+# Updated : 2026 10 18
+#
 # Descrp. : Program to plot data from a MOHID time series file.
 #
 # ###########################################################################
 
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib import axes
+from os import path
 
-from m_inputs import init_plotTS
+from m_inputs import FINIT, init_plotTS
 
 
-def main():
-    # Inputs:
-    #
-    tsfile = init_plotTS()
-    
-    # Read header:
-    #
-    dat = open(tsfile, "r")
-    columns = ""
-    readstop = False
-    linepos = 0
+def plotcolumn(ax, xnum, yval, method: str = "lttb", **kwargs):
+    """Plots a long series with a downsampled line. The amount of
+    points is chosen from the width of the axes, and the line is
+    downsampled again, with the visible points only, when the user
+    zooms or pans the chart.
 
-    while readstop == False:
-        line = dat.readline()
-        linepos += 1
+    Keyword arguments:
+    - ax: matplotlib axes;
+    - xnum: instants as matplotlib dates (floats);
+    - yval: series values;
+    - method: downsampling method ('lttb', 'minmax' or 'none');
+    - kwargs: line properties. Default is a thick blue line.
+    """
 
-        if "YY  MM  DD  hh  mm" in line:
-            columns = line
-        elif "<BeginTimeSerie>" in line:
-            readstop = True
+    import numpy as np
 
-    if not columns:
-        dat.close()
-        print("[ERROR] main: RuntimeError")
-        print("\tFields row not found in TS file.")
-        raise SystemExit
-    
-    # Create data frame and read data:
-    #
-    print("Reading time series...")
-    df = pd.DataFrame([], columns=columns.split())
-    readstop = False
+    from m_downsample import downsample, npoints
 
-    while readstop == False:
-        line = dat.readline()
-        linepos += 1
+    idx = downsample(xnum, yval, npoints(ax, method), method)
+    line, = ax.plot(xnum[idx], yval[idx], **(kwargs or {"c": "b", "lw": 3}))
+    ax.xaxis_date()
 
-        if "<EndTimeSerie>" in line:
-            readstop = True
+    if method == "none":
+        return line
+
+    def update(ax):
+        low, upp = ax.get_xlim()
+        low, upp = np.searchsorted(xnum, [low, upp])
+        low, upp = max(low-1, 0), min(upp+1, len(xnum))
+        sub = downsample(
+            xnum[low:upp], yval[low:upp], npoints(ax, method), method,
+        )
+        line.set_data(xnum[low+sub], yval[low+sub])
+
+    ax.callbacks.connect("xlim_changed", update)
+    return line
+
+
+def plotfile(tsfile: str, columns: list, outdir: str, method: str) -> list:
+    """Saves one figure (PNG) for each field of a MOHID time series
+    file. Returns the list of saved figures.
+
+    Keyword arguments:
+    - tsfile: name and path of the MOHID time series file;
+    - columns: names of the fields to plot. Empty for all;
+    - outdir: path to the output directory;
+    - method: downsampling method ('lttb', 'minmax' or 'none').
+    """
+
+    import matplotlib.pyplot as plt
+    from matplotlib import axes, dates
+
+    from m_readts import readts
+
+    tsr = readts(tsfile)
+    xnum = dates.date2num(tsr.time)
+    stem = path.splitext(path.basename(tsfile))[0]
+    fouts = []
+
+    for col in columns or tsr.columns:
+        if col == "OpenPoint" and not columns: continue
+        if col not in tsr.columns:
+            print(f"[WARNING] p_plotTS.plotfile: '{col}' not in '{tsfile}'")
             continue
 
-        values = line.split()
-        
-        # Check line:
-        if len(values) != len(df.columns):
-            dat.close()
-            print("[ERROR] main: RuntimeError")
-            print(f"\tError in line {linepos} of the time series file.")
+        fout = path.join(outdir, f"{stem}-{col}.png")
+
+        fig, ax = plt.subplots(figsize=(8, 4.5), dpi=150)
+        ax: axes.Axes
+        ax.set_title(f"{stem} - {col}", weight="bold")
+        plotcolumn(ax, xnum, tsr.data[:, tsr.columns.index(col)], method)
+        ax.grid(True, "both", "both")
+        fig.autofmt_xdate()
+        fig.savefig(fout)
+        plt.close(fig)
+
+        fouts.append(fout)
+
+    return fouts
+
+
+def batch(
+    tsfiles: list, columns: list, outdir: str, method: str = "lttb",
+    workers: int = None,
+):
+    """Saves the figures of many MOHID time series files, with one
+    process for each file.
+
+    Keyword arguments:
+    - tsfiles: names and paths of the MOHID time series files;
+    - columns: names of the fields to plot. Empty for all;
+    - outdir: path to the output directory;
+    - method: downsampling method ('lttb', 'minmax' or 'none');
+    - workers: number of processes. None for the number of CPUs.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    for tsfile in tsfiles:
+        if not path.isfile(tsfile):
+            print("[ERROR] p_plotTS.batch: FileNotFoundError")
+            print(f"\tTime series file not found: '{tsfile}' .")
             raise SystemExit
-        
-        df.loc[len(df)] = values
-    
-    dat.close
 
-    # Filter dataframe:
+    if not path.isdir(outdir):
+        print("[ERROR] p_plotTS.batch: FileNotFoundError")
+        print(f"\tOutput directory not found: '{outdir}'.")
+        raise SystemExit
+
+    nfiles = len(tsfiles)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for fouts in pool.map(
+            plotfile, tsfiles, [columns]*nfiles, [outdir]*nfiles,
+            [method]*nfiles,
+        ):
+            for fout in fouts: print(fout)
+
+
+def merge(tsfiles: list, column: str, fout: str):
+    """Saves one field of many MOHID time series files in a CSV table,
+    with one column for each station (see m_readts.alignts).
+
+    Keyword arguments:
+    - tsfiles: names and paths of the MOHID time series files;
+    - column: name of the field. Can be None if the files have
+        only one field;
+    - fout: name and path of the output CSV file.
+    """
+
+    import pandas as pd
+
+    from m_readts import alignts, readts
+
+    series = {tsfile: readts(tsfile) for tsfile in tsfiles}
+    time, names, table = alignts(series, column)
+    df = pd.DataFrame(
+        table, index=pd.DatetimeIndex(time, name="time"), columns=names,
+    )
+    df.to_csv(fout)
+    print(fout)
+
+
+def main(fipt: str = FINIT, over: dict = None, method: str = "lttb"):
+    # Inputs:
+    #
+    tsfiles = init_plotTS(fipt, over)
+
+    # The plotting modules are only imported after the inputs are
+    # checked, so that wrong inputs fail fast:
     #
-    df = df.drop(["Seconds"], axis=1)
-    
-    if "OpenPoint" in df.columns:
-        df = df.drop(["OpenPoint"], axis=1)
+    import matplotlib.pyplot as plt
+    from matplotlib import axes, dates
 
-    # Create datetime series:
-    df = df.rename(columns={
-        "YY": "year", "MM": "month", "DD": "day",
-        "hh": "hours", "mm": "minutes", "ss": "seconds",
-    })
+    from m_readts import alignts, readts
 
-    dtseries = pd.to_datetime(df.loc[:, "year": "seconds"])
+    # Read the files (stations) once, before the questions:
+    #
+    print("Reading time series...")
+    series = {tsfile: readts(tsfile) for tsfile in tsfiles}
+
+    # Fields common to all the files:
+    #
+    columns = None
 
-    df = df.drop([
-        "year", "month", "day", "hours", "minutes", "seconds"
-    ], axis=1)
+    for tsr in series.values():
+        if columns is None: columns = list(tsr.columns)
+        columns = [col for col in columns if col in tsr.columns]
 
-    # Convert to floats:
-    df = df.astype("f8")
-    columns = df.columns.to_list()
+    columns = [col for col in columns if col != "OpenPoint"]
 
-    # Plot data frame:
+    if not columns:
+        print("[ERROR] main: RuntimeError")
+        print("\tThe time series files have no fields in common.")
+        raise SystemExit
+
+    # Plot fields:
     #
     readstop = False
 
@@ -111,10 +210,21 @@ def main():
             readstop = True
             continue
 
+        # Align the field of all the files (stations):
+        time, names, table = alignts(series, columns[int(userop)-1])
+        xnum = dates.date2num(time)
+
         # Plot field:
         fig, ax = plt.subplots()
         ax: axes.Axes
-        ax.plot(dtseries, df[columns[int(userop)-1]], "b", lw=3)
+
+        if len(names) == 1:
+            plotcolumn(ax, xnum, table[:, 0], method)
+        else:
+            for pos, name in enumerate(names):
+                plotcolumn(ax, xnum, table[:, pos], method, label=name)
+            ax.legend()
+
         ax.grid(True, "both", "both")
         plt.show()
         plt.close(fig)
@@ -0,0 +1,156 @@
+# ###########################################################################
+#
+# File    : p_plotVERT.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Program to plot vertical sections (distance-depth) and
+#           profiles (time-depth, Hovmöller) of a MOHID HDF5 field.
+#
+# ###########################################################################
+
+from glob import glob
+from os import path
+
+from m_inputs import FINIT, init_plotVERT
+
+
+def main(fipt: str = FINIT, over: dict = None):
+    # Inputs:
+    #
+    inpts = init_plotVERT(fipt, over)
+
+    hdf = inpts.get("hdf")
+    outdir = inpts.get("outdir")
+    prefix = inpts.get("prefix")
+
+    fld = inpts.get("field")
+    mode = inpts.get("mode")
+    points = inpts.get("points")
+
+    cmap = inpts.get("cmap")
+    label = inpts.get("label")
+    levels = inpts.get("levels")
+    timestr = inpts.get("timestr")
+
+    del inpts
+
+    # The plotting modules are only imported after the inputs are
+    # checked, so that wrong inputs fail fast:
+    #
+    import imageio.v3 as iio
+    import numpy as np
+    from matplotlib import axes, colors, dates
+    from matplotlib import pyplot as plt
+
+    from m_readhdf import getprofile, getsection, getTime
+
+    # Get data from HDF file. Only the cells of the section or
+    # of the profile are read:
+    #
+    dtout = getTime(hdf)
+
+    if mode == "section":
+        data, depth, dist = getsection(hdf, "Results/" + fld, points)
+    else:
+        data, depth = getprofile(hdf, "Results/" + fld, *points[0])
+        data = data[..., None]
+        if depth is not None: depth = depth[..., None]
+
+    # Vertical axis. Without a vertical grid use the layer index.
+    # Closed cells have no valid depth, so they are moved to the
+    # bottom (their values are masked anyway):
+    #
+    if depth is None:
+        depth = np.broadcast_to(
+            np.arange(data.shape[1])[None, :, None], data.shape,
+        )
+        ylabel = "Layer"
+    else:
+        depth = np.ma.masked_invalid(np.ma.masked_less(depth, -98))
+        depth = depth.filled(depth.max())
+        ylabel = "Depth [m]"
+
+    vmax, vmin = data.max(), data.min()
+    norm = colors.BoundaryNorm(
+        boundaries=np.linspace(vmin, vmax, levels), ncolors=256,
+        extend="both",
+    )
+
+    # Profile: one time-depth (Hovmöller) figure:
+    #
+    if mode == "profile":
+        fout = path.join(outdir, prefix + "profile.png")
+        print(fout)
+
+        xnum = np.broadcast_to(
+            dates.date2num(dtout)[:, None], data.shape[:2],
+        )
+
+        fig, ax = plt.subplots(figsize=(8, 4.5))
+        ax: axes.Axes
+        ax.set_title(f"{fld} at {points[0][0]}°E, {points[0][1]}°N",
+                     weight="bold")
+        ax.set_facecolor("silver")
+        ax.set_ylabel(ylabel)
+
+        pcm = ax.pcolormesh(
+            xnum.T, depth[:, :, 0].T, data[:, :, 0].T,
+            norm=norm, cmap=cmap, shading="nearest",
+        )
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(dates.DateFormatter(timestr))
+        ax.invert_yaxis()
+        fig.autofmt_xdate()
+
+        cbar = fig.colorbar(pcm, ax=ax, label=label)
+        cbar.ax.yaxis.set_label_position("left")
+
+        fig.savefig(fout, dpi=600)
+        plt.close(fig)
+        return
+
+    # Section: one distance-depth figure for each time step:
+    #
+    xdist = np.broadcast_to(dist[None, :], data.shape[1:])
+
+    for pos, inst in enumerate(dtout):
+        fout = path.join(outdir, prefix + inst.strftime("%Y%m%dT%H%M.png"))
+        print(fout)
+
+        fig, ax = plt.subplots(figsize=(8, 4.5))
+        ax: axes.Axes
+        ax.set_title(inst.strftime(timestr), weight="bold")
+        ax.set_facecolor("silver")
+        ax.set_xlabel("Distance [km]")
+        ax.set_ylabel(ylabel)
+
+        pcm = ax.pcolormesh(
+            xdist, depth[pos], data[pos],
+            norm=norm, cmap=cmap, shading="nearest",
+        )
+        ax.invert_yaxis()
+
+        cbar = fig.colorbar(pcm, ax=ax, label=label)
+        cbar.ax.yaxis.set_label_position("left")
+
+        fig.savefig(fout, dpi=600)
+        plt.close(fig)
+
+    # Make animation:
+    #
+    pngs = sorted(glob(path.join(outdir, prefix + "*.png")))
+
+    if len(pngs) < 2:
+        return
+
+    print("Making animation...")
+    pngs = np.array([iio.imread(png) for png in pngs])
+    fout = path.join(outdir, prefix + "animation.gif")
+    iio.imwrite(fout, pngs, fps=1, loop=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# ###########################################################################
+#
+# File    : p_statsLAGR.py
+#
+# Author  : Fernando Mendonça (CIMA UAlg)
+#
+# Created : 2026 10 18
+#
+# Descrp. : Program to compute residence times, arrival times and the
+#           connectivity between polygons of a Lagrangian origin of a
+#           MOHID HDF5 file.
+#
+# ###########################################################################
+
+from os import path
+
+from m_inputs import FINIT, init_statsLAGR
+
+
+def main(fipt: str = FINIT, over: dict = None):
+    # Inputs:
+    #
+    inpts = init_statsLAGR(fipt, over)
+
+    hdfin = inpts.get("hdf")
+    outdir = inpts.get("outdir")
+    origin_name = inpts.get("origin_name")
+    polygons = inpts.get("polygons")
+    depth = inpts.get("prefetch", 2)
+
+    del inpts
+
+    # The analysis modules are only imported after the inputs are
+    # checked, so that wrong inputs fail fast:
+    #
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from matplotlib import axes
+
+    from m_lagrstats import lagrstats
+    from m_readhdf import getbatim
+
+    print("Reading particles...")
+    stats = lagrstats(hdfin, origin_name, polygons, depth)
+    names = stats["names"]
+    fout = path.join(outdir, origin_name)
+
+    # Connectivity matrix (fraction of the particles released in each
+    # polygon, rows, that entered each polygon after release, columns.
+    # The diagonal is the fraction that left and came back):
+    #
+    count = stats["count"]
+    conn = stats["connect"] / np.maximum(count, 1)[:, None]
+
+    with open(fout + "-connectivity.csv", "w") as dat:
+        dat.write("source,released," + ",".join(names) + "\n")
+        for pos, name in enumerate(names):
+            dat.write(f"{name},{count[pos]},")
+            dat.write(",".join(f"{val:.6f}" for val in conn[pos]) + "\n")
+
+    print(fout + "-connectivity.csv")
+
+    # Residence time of the particles that entered each polygon:
+    #
+    resid = stats["residence"]
+
+    with open(fout + "-residence.csv", "w") as dat:
+        dat.write("polygon,particles,mean_h,median_h,max_h\n")
+        for pos, name in enumerate(names):
+            vals = resid[:, pos][resid[:, pos] > 0]
+            if not len(vals): vals = np.zeros(1)
+            dat.write(f"{name},{np.count_nonzero(resid[:, pos])},")
+            dat.write(f"{vals.mean():.3f},{np.median(vals):.3f},")
+            dat.write(f"{vals.max():.3f}\n")
+
+    print(fout + "-residence.csv")
+
+    # Arrival time map:
+    #
+    lat, lon = stats["lat"], stats["lon"]
+    arrival = stats["arrival"]
+    np.savetxt(fout + "-arrival.csv", arrival, fmt="%.3f", delimiter=",")
+    print(fout + "-arrival.csv")
+
+    # Make all water cells as 1 and land cells 0:
+    batim = getbatim(hdfin)
+    batim = (batim/batim).astype("i2")
+
+    fig, ax = plt.subplots()
+    ax: axes.Axes
+    ax.set_title(f"{origin_name} - arrival time", weight="bold")
+    ax.set_facecolor("silver")
+    ax.set_xlabel("Longitude [°E]")
+    ax.set_ylabel("Latitude [°N]")
+
+    ax.pcolormesh(lon[:-1], lat[:-1], batim, cmap="Greys")
+    pcm = ax.pcolormesh(lon, lat, np.ma.masked_invalid(arrival), cmap="jet")
+
+    for name in names:
+        pol = np.array(polygons[name] + polygons[name][:1])
+        ax.plot(pol[:, 0], pol[:, 1], "k", lw=1)
+        ax.annotate(name, pol[:-1].mean(axis=0), ha="center", weight="bold")
+
+    cbar = fig.colorbar(pcm, ax=ax, label="Hours since the first step")
+    cbar.ax.yaxis.set_label_position("left")
+
+    fig.savefig(fout + "-arrival.png", dpi=600)
+    plt.close(fig)
+    print(fout + "-arrival.png")
+
+
+if __name__ == "__main__":
+    main()